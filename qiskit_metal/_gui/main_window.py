@@ -225,6 +225,7 @@ class MetalGUI(QMainWindowBaseHandler):
     _QMainWindowClass = QMainWindowExtension
     _img_logo_name = 'metal_logo.png'
     _stylesheet_default = 'metal_dark'
+    _auto_refresh_interval = 500  # ms
 
     # This is somewhat outdated
     _dock_names = [
@@ -268,6 +269,7 @@ class MetalGUI(QMainWindowBaseHandler):
         self.ui.actionRebuild.setIcon(self.action_rebuild_deactive_icon)
         #self.ui.toolBarDesign.setIconSize(QSize(20,20))
 
+        self._setup_auto_refresh()
         self._setup_component_widget()
         self._setup_plot_widget()
         self._setup_design_components_widget()
@@ -473,6 +475,34 @@ class MetalGUI(QMainWindowBaseHandler):
                                           logger=self.logger,
                                           tableView=self.ui.tableComponents)
         self.ui.tableComponents.setModel(model)
+        self.register_auto_refresh(model)
+
+    def _setup_auto_refresh(self):
+        """Setup the timer that refreshes the registered models.
+
+        The design does not signal when components are added, deleted or
+        renamed, for instance from a script. So a single timer, shared by
+        all the models, calls their `refresh_auto` periodically instead.
+        """
+        self._auto_refresh_models = []
+        self._auto_refresh_timer = QTimer(self.main_window)
+        self._auto_refresh_timer.timeout.connect(self._auto_refresh)
+        self._auto_refresh_timer.start(self._auto_refresh_interval)
+
+    def register_auto_refresh(self, model):
+        """Register a model to be refreshed periodically by the gui.
+
+        Args:
+            model (QAbstractItemModel): A model with a `refresh_auto` method,
+                which should return quickly when nothing changed.
+        """
+        if model not in self._auto_refresh_models:
+            self._auto_refresh_models.append(model)
+
+    def _auto_refresh(self):
+        """Call `refresh_auto` on each registered model."""
+        for model in self._auto_refresh_models:
+            model.refresh_auto()
 
     def _create_new_component_object_from_qlibrary(self, full_path: str):
         """
@@ -13,14 +13,14 @@
 # that they have been altered from the originals.
 
 import numpy as np
-from PySide2 import QtCore, QtWidgets
-from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide2 import QtWidgets
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
 from PySide2.QtGui import QBrush, QColor, QFont, QIcon, QPixmap
 from PySide2.QtWidgets import QTableView
 
 from ...utility._handle_qt_messages import slot_catch_error
 from ...utility._toolbox_qt import blend_colors
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from .table_view_all_components import QTableView_AllComponents
@@ -40,8 +40,10 @@ class QTableModel_AllComponents(QAbstractTableModel):
         model = t.model()
         index = model.index(1,0)
         model.data(index)
+
+    The gui calls `refresh_auto` periodically, which only updates the rows
+    of the components that changed, see `MetalGUI.register_auto_refresh`.
     """
-    __timer_interval = 500  # ms
 
     def __init__(self,
                  gui,
@@ -63,55 +65,194 @@ class QTableModel_AllComponents(QAbstractTableModel):
             'Name', 'QComponent class', 'QComponent module', 'Build status',
             'id'
         ]
-        self._row_count = -1
-
-        self._create_timer()
+        self._placeholder_shown = None  # type: Optional[bool]
+
+        # Component names and the strings displayed in each column, in row
+        # order. Cached so that data(), which Qt calls for every cell and
+        # role, does not look them up on the components.
+        self._component_names = []
+        self._component_rows = []
+
+        # Qt objects returned by data() and headerData(), built only once
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._warning_icon = QIcon(":/sample_shapes/warning")
+        self._fail_brush = None
+
+        # Handlers of the roles answered by data(); other roles return None.
+        # Keyed by int, since data() may be called with plain int roles.
+        self._role_handlers = {
+            int(Qt.DisplayRole): self._data_display,
+            int(Qt.FontRole): self._data_font,
+            int(Qt.BackgroundRole): self._data_background,
+            int(Qt.DecorationRole): self._data_decoration,
+            int(Qt.ToolTipRole): self._data_tooltip,
+            int(Qt.StatusTipRole): self._data_tooltip,
+        }
+
+        # Collapse the column resizes of consecutive refreshes into one
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self._resize_columns)
 
     @property
     def design(self):
         """Returns the design."""
         return self.gui.design
 
-    def _create_timer(self):
-        """Refresh the model number of rows, etc.
+    def _design_components(self) -> tuple:
+        """Get the names of the design components and the strings displayed in
+        their rows, in the order in which they are shown in the table.
+
+        Returns:
+            tuple: List of names, list of tuples with one string per column
+            followed by the tooltip of the row
+        """
+        names = []
+        rows = []
+        if self.design:
+            for name, component in self.design.components.items():
+                class_name = component.__class__.__name__
+                module_name = component.__class__.__module__
+                tooltip = f"""Component name= "{component.name}" instance of class "{class_name}" from module "{module_name}" """
+                names.append(name)
+                rows.append((str(name), str(class_name), str(module_name),
+                             str(component.status), str(component.id), tooltip))
+        return names, rows
+
+    def _cache_components(self):
+        """Snapshot the names and display strings of the design components.
+
+        The model serves rowCount() and data() from this snapshot, so that
+        the view only sees changes once it has been notified of them.
+        """
+        self._component_names, self._component_rows = self._design_components()
+
+    def _get_fail_brush(self) -> QBrush:
+        """Get the background brush of components that failed to build.
+
+        The brush is built on first use and kept until `reset_fail_brush`.
 
-        there must be a smarter way?
+        Returns:
+            QBrush: The background brush
         """
-        self._timer = QtCore.QTimer(self)
-        self._timer.start(self.__timer_interval)
-        self._timer.timeout.connect(self.refresh_auto)
+        if self._fail_brush is None:
+            if self._tableView:
+                table = self._tableView
+                color = table.palette().color(table.backgroundRole())
+                color = blend_colors(color, QColor('#FF0000'), r=0.6)
+            else:
+                color = QColor('#FF0000')
+            self._fail_brush = QBrush(color)
+        return self._fail_brush
+
+    def reset_fail_brush(self):
+        """Rebuild the background brush of failed components the next time it
+        is needed. Called by the view when its palette changes."""
+        self._fail_brush = None
 
     def refresh(self):
         """Force refresh.
 
         Completly rebuild the model.
         """
+        self._cache_components()
         self.modelReset.emit()
+        self.update_view()
 
     def refresh_auto(self):
-        """Automatic refresh, update row count, view, etc."""
-        # We could not do if the widget is hidden
-        new_count = self.rowCount()
+        """Refresh only the rows of the components that were added, deleted,
+        renamed or rebuilt since the last refresh.
+
+        Unlike `refresh`, this does not reset the model, so the selection and
+        scroll position of the view are kept.
+
+        Nothing is done while the view is hidden; the view calls this method
+        again when it is shown.
+        """
+        if self._tableView and not self._tableView.isVisible():
+            return
 
-        # if the number of rows have changed
-        if self._row_count != new_count:
-            #self.logger.info('Number of components changed')
+        names, rows = self._design_components()
+        old_names = self._component_names
+        old_rows = self._component_rows
+        old_count = len(old_names)
+        kept = set(names)
+
+        if len(names) == old_count:
+            # Components were renamed or rebuilt, or nothing changed
+            self._component_names, self._component_rows = names, rows
+            self._emit_rows_changed(old_rows, rows)
+
+        elif names[:old_count] == old_names:
+            # Components were appended
+            self.beginInsertRows(QModelIndex(), old_count, len(names) - 1)
+            self._component_names, self._component_rows = names, rows
+            self.endInsertRows()
+            self._emit_rows_changed(old_rows, rows[:old_count])
+            self.update_view()
+
+        elif [name for name in old_names if name in kept] == names:
+            # Components were deleted. Remove contiguous ranges of rows,
+            # last one first, so that the rows still to remove do not move.
+            ranges = []
+            for row, name in enumerate(old_names):
+                if name in kept:
+                    continue
+                if ranges and ranges[-1][1] == row - 1:
+                    ranges[-1][1] = row
+                else:
+                    ranges.append([row, row])
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._component_names[first:last + 1]
+                del self._component_rows[first:last + 1]
+                self.endRemoveRows()
+            old_rows = self._component_rows
+            self._component_names, self._component_rows = names, rows
+            self._emit_rows_changed(old_rows, rows)
 
+        else:
             # When a model is reset it should be considered that all
             # information previously retrieved from it is invalid.
             # This includes but is not limited to the rowCount() and
             # columnCount(), flags(), data retrieved through data(), and roleNames().
             # This will loose the current selection.
+            self._component_names, self._component_rows = names, rows
             self.modelReset.emit()
+            self.update_view()
 
-            # for some reason the horizontal header is hidden even if i call this in init
-            self._tableView.horizontalHeader().show()
+    def _emit_rows_changed(self, old_rows: list, new_rows: list):
+        """Notify the view of the rows whose displayed strings changed, e.g.
+        the name, or the build status after a rebuild.
 
-            self._row_count = new_count
-            self.update_view()
+        Args:
+            old_rows (list): Rows previously shown
+            new_rows (list): Rows now shown in the same places
+        """
+        changed = [
+            row for row, (old, new) in enumerate(zip(old_rows, new_rows))
+            if old != new
+        ]
+        if changed:
+            self.dataChanged.emit(
+                self.index(changed[0], 0),
+                self.index(changed[-1],
+                           self.columnCount() - 1))
 
     def update_view(self):
-        """Updates the view."""
+        """Updates the view.
+
+        The columns are resized shortly after, once for any number of
+        consecutive calls.
+        """
+        if self._tableView:
+            self._tableView.horizontalHeader().show()
+            self._resize_timer.start()
+
+    def _resize_columns(self):
+        """Resize the columns of the view to their contents."""
         if self._tableView:
             self._tableView.resizeColumnsToContents()
 
@@ -125,15 +266,20 @@ class QTableModel_AllComponents(QAbstractTableModel):
             int: The number of rows
         """
         if self.design:  # should we just enforce this
-            num = int(len(self.design.components))
-            if num == 0:
+            num = len(self._component_names)
+        else:
+            num = 0
+
+        # Qt calls rowCount very often, only toggle the placeholder on change
+        show_placeholder = num == 0
+        if self._placeholder_shown != show_placeholder:
+            if show_placeholder:
                 self._tableView.show_placeholder_text()
             else:
                 self._tableView.hide_placeholder_text()
-            return num
-        else:
-            self._tableView.show_placeholder_text()
-            return 0
+            self._placeholder_shown = show_placeholder
+
+        return num
 
     def columnCount(self, parent: QModelIndex = None):
         """Returns the number of columns.
@@ -169,9 +315,7 @@ class QTableModel_AllComponents(QAbstractTableModel):
 
         elif role == Qt.FontRole:
             if section == 0:
-                font = QFont()
-                font.setBold(True)
-                return font
+                return self._bold_font
 
     def flags(self, index):
         """Set the item flags at the given index.
@@ -200,53 +344,35 @@ class QTableModel_AllComponents(QAbstractTableModel):
             str: Data depending on the index and role
         """
 
-        if not index.isValid() or not self.design:
+        handler = self._role_handlers.get(int(role))
+        if handler is None or not index.isValid() or not self.design:
             return
 
-        component_name = list(self.design.components.keys())[index.row()]
-
-        if role == Qt.DisplayRole:
-
-            if index.column() == 0:
-                return str(component_name)
-            elif index.column() == 1:
-                return str(
-                    self.design.components[component_name].__class__.__name__)
-            elif index.column() == 2:
-                return str(
-                    self.design.components[component_name].__class__.__module__)
-            elif index.column() == 3:
-                return str(self.design.components[component_name].status)
-            elif index.column() == 4:
-                return str(self.design.components[component_name].id)
-
-        # The font used for items rendered with the default delegate. (QFont)
-        elif role == Qt.FontRole:
-            if index.column() == 0:
-                font = QFont()
-                font.setBold(True)
-                return font
-
-        elif role == Qt.BackgroundRole:
-
-            component = self.design.components[component_name]
-            if component.status != 'good':  # Did the component fail the build
-                #    and index.column()==0:
-                if not self._tableView:
-                    return QBrush(QColor('#FF0000'))
-                table = self._tableView
-                color = table.palette().color(table.backgroundRole())
-                color = blend_colors(color, QColor('#FF0000'), r=0.6)
-                return QBrush(color)
-
-        elif role == Qt.DecorationRole:
-
-            if index.column() == 0:
-                component = self.design.components[component_name]
-                if component.status != 'good':  # Did the component fail the build
-                    return QIcon(":/sample_shapes/warning")
-
-        elif role == Qt.ToolTipRole or role == Qt.StatusTipRole:
-            component = self.design.components[component_name]
-            text = f"""Component name= "{component.name}" instance of class "{component.__class__.__name__}" from module "{component.__class__.__module__}" """
-            return text
+        row = index.row()
+        if row >= len(self._component_rows):
+            return
+        return handler(index.column(), self._component_rows[row])
+
+    def _data_display(self, column: int, row_data: tuple):
+        """Text of the cell."""
+        if column < len(self.columns):
+            return row_data[column]
+
+    def _data_font(self, column: int, row_data: tuple):
+        """The font used for items rendered with the default delegate. (QFont)"""
+        if column == 0:
+            return self._bold_font
+
+    def _data_background(self, column: int, row_data: tuple):
+        """Background of the rows of components that failed the build."""
+        if row_data[3] != 'good':
+            return self._get_fail_brush()
+
+    def _data_decoration(self, column: int, row_data: tuple):
+        """Warning icon next to the name of components that failed the build."""
+        if column == 0 and row_data[3] != 'good':
+            return self._warning_icon
+
+    def _data_tooltip(self, column: int, row_data: tuple):
+        """Tooltip and status tip of the row."""
+        return row_data[-1]
@@ -16,8 +16,8 @@ from typing import TYPE_CHECKING
 from typing import List
 
 from PySide2 import QtCore, QtWidgets
-from PySide2.QtCore import QModelIndex, Qt, QTimer
-from PySide2.QtGui import QContextMenuEvent
+from PySide2.QtCore import QEvent, QModelIndex, Qt, QTimer
+from PySide2.QtGui import QContextMenuEvent, QShowEvent
 from PySide2.QtWidgets import (QInputDialog, QLabel, QLineEdit, QMenu,
                                QMessageBox, QTableView, QVBoxLayout,
                                QAbstractItemView)
@@ -63,7 +63,7 @@ class QTableView_AllComponents(QTableView, QWidget_PlaceholderText):
     def style2(self):
         """Style the widget."""
         # Do in the ui file
-        self.horizontalHeader().hide()
+        # The horizontal header is shown by the model once it is populated
         self.verticalHeader().show()
 
         self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
@@ -77,6 +77,26 @@ class QTableView_AllComponents(QTableView, QWidget_PlaceholderText):
         """Returns the design."""
         return self.model().design
 
+    def showEvent(self, event: QShowEvent):
+        """Catch up with the changes to the components made while hidden.
+
+        Args:
+            event (QShowEvent): The event
+        """
+        super().showEvent(event)
+        if self.model():
+            self.model().refresh_auto()
+
+    def changeEvent(self, event: QEvent):
+        """Invalidate the colors cached by the model when the palette changes.
+
+        Args:
+            event (QEvent): The event
+        """
+        if event.type() == QEvent.PaletteChange and self.model():
+            self.model().reset_fail_brush()
+        super().changeEvent(event)
+
     @property
     def logger(self):
         """Returns the logger."""
@@ -155,6 +175,7 @@ class QTableView_AllComponents(QTableView, QWidget_PlaceholderText):
         """
         self.logger.info(f'Deleting {name}')
         self.design.delete_component(name)
+        self.model().refresh_auto()
         # replot
         self.gui.plot_win.replot()
 
@@ -175,6 +196,7 @@ class QTableView_AllComponents(QTableView, QWidget_PlaceholderText):
                 self.logger.info(f'Renaming {name} to {text}')
                 comp_id = self.design.components[name].id
                 self.design.rename_component(comp_id, text)
+                self.model().refresh_auto()
 
     def viewClicked(self, index: QModelIndex):
         """Select a component and set it in the compoient widget when you left
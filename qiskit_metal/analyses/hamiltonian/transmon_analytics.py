@@ -24,9 +24,10 @@ Key References:
 
 """
 
+from functools import lru_cache
+
 from scipy.special import mathieu_a
 import numpy as np
-import matplotlib.pyplot as plt
 
 __all__ = ['kidx_raw', 'kidx', 'transmon_eigenvalue', 'plot_eigenvalues']
 
@@ -36,18 +37,19 @@ def kidx_raw(m, my_ng):
     This function calculates the integers which correct sort the eigenstates and eigenenergies
     of the solution to Mathieu's equation.
 
+    Both arguments may be scalars or numpy arrays; arrays are broadcast against
+    each other, so a whole (m, ng) grid can be evaluated in a single call.
+
         Args:
-            m (int): The energy level of the qubit (m=0,1,2,3,etc.)
-            my_ng (float): the offset charge of the Josephjunction island (in units of 2e)
+            m (int or np.ndarray): The energy level of the qubit (m=0,1,2,3,etc.)
+            my_ng (float or np.ndarray): the offset charge of the Josephjunction island (in units of 2e)
 
         Returns:
-            float: the calculated index
+            float or np.ndarray: the calculated index
     """
-    if my_ng == 0:
-        return m + 1.0 - ((m + 1.0) % 2.0)
-
-    return m + 1.0 - ((m + 1.0) % 2.0) + 2.0 * my_ng * (
-        (-1.0)**(m - 0.5 * (np.sign(my_ng) - 1.0)))
+    # 2 * ng * (-1)**(m - (sign(ng) - 1) / 2) reduces to 2 * |ng| * (-1)**m,
+    # which also removes the special case at ng = 0.
+    return m + 1.0 - ((m + 1.0) % 2.0) + 2.0 * np.abs(my_ng) * (-1.0)**m
 
 
 def kidx(m, my_ng):
@@ -74,6 +76,13 @@ RATIO = 1.0
 E_C = 1.0
 
 
+@lru_cache(maxsize=1024)
+def _mathieu_a_scalar(index, q):
+    """Memoized scalar Mathieu characteristic value, since the same few (index, q)
+    pairs are requested repeatedly when evaluating single levels."""
+    return mathieu_a(index, q)
+
+
 def transmon_eigenvalue(m, my_ng):
     """
     This function calculate the energy eigenvalue of the transmon qubit for a given
@@ -81,73 +90,57 @@ def transmon_eigenvalue(m, my_ng):
     calculate the index using the function defined above, and then the calculated
     index is used to calculate the energy eigenvalue using Mathieu's characteristic values.
 
+    Since ``mathieu_a`` is a numpy ufunc, ``m`` and ``my_ng`` may be arrays which
+    are broadcast against each other.
+
         Args:
-            m (int): The energy level of the qubit (m=0,1,2,3,etc.)
-            ng (float): the offset charge of the Josephjunction island (in units of 2e)
+            m (int or np.ndarray): The energy level of the qubit (m=0,1,2,3,etc.)
+            ng (float or np.ndarray): the offset charge of the Josephjunction island (in units of 2e)
 
         Returns:
-            float: the calculated energy eigenvalue.
+            float or np.ndarray: the calculated energy eigenvalue.
     """
     index = kidx(m, my_ng)
+    if np.ndim(index) == 0:
+        return (E_C) * _mathieu_a_scalar(float(index), -0.5 * RATIO)
     return (E_C) * mathieu_a(index, -0.5 * RATIO)
 
 
-# extremely coarse grid: only three points from -0.5 to 0.5. This so that only integer values
-# of the index are used in the calculation of the Mathieu characteristic value.
-ng = np.linspace(-0.5, 0.5, 3)
-
-# ng is periodic extending from -2 to 2:
-ng_periodic = np.linspace(-2.0, 2.0, 9)
-
-# define energies between (-0.5, 0.5) as empty lists.
-E0 = []
-E1 = []
-E2 = []
-E3 = []
-
-# define periodic energies between (-2.0, 2.0)
-E0_periodic = [None] * 9
-E1_periodic = [None] * 9
-E2_periodic = [None] * 9
-E3_periodic = [None] * 9
-
-# calculate the energies for m=0,1,2 at each value of offset charge
-for i in ng:
-    E0.append(transmon_eigenvalue(0, i))
-    E1.append(transmon_eigenvalue(1, i))
-    E2.append(transmon_eigenvalue(2, i))
-    E3.append(transmon_eigenvalue(3, i))
-
-# define the periodic eigen energies based on the values between (-0.5,0.5)
-for i in range(len(E0_periodic)):
-    E0_periodic[0] = E0[1]
-    E0_periodic[1] = E0[0]
-    E1_periodic[0] = E1[1]
-    E1_periodic[1] = E1[0]
-    E2_periodic[0] = E2[1]
-    E2_periodic[1] = E2[0]
-    E3_periodic[0] = E3[1]
-    E3_periodic[1] = E3[0]
-
-    if i > 1:
-        E0_periodic[i] = E0_periodic[i - 2]
-        E1_periodic[i] = E1_periodic[i - 2]
-        E2_periodic[i] = E2_periodic[i - 2]
-        E3_periodic[i] = E3_periodic[i - 2]
-
-
-def plot_eigenvalues():
+def plot_eigenvalues(n_levels: int = 4):
     """
     This function actually creates the plot(s) of eigenvalues as a function of
-    offset charge. No arguments need to be passed.
+    offset charge. The eigenvalues are only calculated when this function is called,
+    and matplotlib is only imported then.
+
+    Args:
+        n_levels (int): Number of energy levels to plot, starting from m=0.
+            Defaults to 4.
 
     Returns:
         A plot of the eigenvalues as a function of offset charge.
     """
+    import matplotlib.pyplot as plt
+
+    # extremely coarse grid: only three points from -0.5 to 0.5. This so that only integer values
+    # of the index are used in the calculation of the Mathieu characteristic value.
+    ng = np.linspace(-0.5, 0.5, 3)
+
+    # ng is periodic extending from -2 to 2:
+    ng_periodic = np.linspace(-2.0, 2.0, 9)
+
+    # calculate the energies for each level at each value of offset charge in a
+    # single broadcast call, one row per energy level
+    energies = transmon_eigenvalue(np.arange(n_levels)[:, None], ng[None, :])
+
+    # define the periodic eigen energies between (-2.0, 2.0) based on the values
+    # between (-0.5,0.5): ng_periodic alternates between integer and half-integer
+    # offset charges, i.e. between the ng=0 and ng=-0.5 columns of the energies.
+    periodic_idx = (np.arange(len(ng_periodic)) + 1) % 2
+    energies_periodic = energies[:, periodic_idx]
+
     # plot the PERIODIC eigen energies between (-2.0, 2.0)
-    plt.plot(ng_periodic, E0_periodic, 'k')  # m=0
-    plt.plot(ng_periodic, E1_periodic, 'r')  # m=1
-    plt.plot(ng_periodic, E2_periodic, 'b')  # m=2
-    plt.plot(ng_periodic, E3_periodic, 'm')  # m=3
+    colors = ['k', 'r', 'b', 'm']  # m=0,1,2,3
+    for m, energy_periodic in enumerate(energies_periodic):
+        plt.plot(ng_periodic, energy_periodic, colors[m % len(colors)])
     plt.xlabel("Offset Charge [ng]")
     plt.ylabel("Energy E_m[ng]")
@@ -21,22 +21,26 @@ Each function prints out the parameters and outputs a dictionary.
 # pylint: disable=invalid-name
 
 import io
+import math
 import re
+import warnings
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.optimize as opt
+from scipy.linalg import eigh_tridiagonal
 from pint import UnitRegistry
 
 __all__ = [
     'Ic_from_Lj', 'Ic_from_Ej', 'Cs_from_Ec', 'transmon_props', 'chi',
     'extract_transmon_coupled_Noscillator', 'levels_vs_ng_real_units',
-    'get_C_and_Ic', 'cos_to_mega_and_delta', 'chargeline_T1',
-    'readin_q3d_matrix', 'readin_q3d_matrix_m', 'load_q3d_capacitance_matrix',
-    'df_cmat_style_print', 'move_index_to', 'df_reorder_matrix_basis'
+    'levels_vs_ng_real_units_batched', 'get_C_and_Ic', 'cos_to_mega_and_delta',
+    'chargeline_T1', 'readin_q3d_matrix', 'readin_q3d_matrix_m',
+    'load_q3d_capacitance_matrix', 'df_cmat_style_print', 'move_index_to',
+    'df_reorder_matrix_basis'
 ]
 
 # define constants
@@ -46,6 +50,19 @@ hbar = 1.0545718E-34  # Plank's reduced
 phinot = 2.067 * 1E-15  # magnetic flux quantum
 phi0 = phinot / (2 * np.pi)  # reduced magnetic flux quantum
 
+# prefactor of the charge dispersion of the first excited level,
+# 2**(4m+5) / m! * sqrt(2/pi) for m=1, Koch et al. Eq. (2.5)
+_EPS1_COEFF = 2**9 * np.sqrt(2 / np.pi)
+
+# largest charge state kept in the transmon charge basis, by default
+_NMAX = 40
+
+# patterns of the Q3D exports
+_RE_C_UNITS = re.compile(r'C Units:(.*?),')
+_RE_DESIGN_VARIATION = re.compile(r'DesignVariation:(.*?)\n')
+_RE_DESIGN_VARIATION_SPACED = re.compile(r'Design Variation:(.*?)\n')
+_RE_CAP_MATRIX = re.compile(r'capMatrix (.*?)]', re.DOTALL)
+
 # TODO: Move to a more generic file
 
 
@@ -100,14 +117,14 @@ def transmon_props(Ic: float, Cq: float):
 
     LJ = phi0 / Ic
     EJ = phi0**2 / LJ / hbar
-    Zqp = np.sqrt(LJ / Cq)
+    Zqp = math.sqrt(LJ / Cq)
     EC = e**2 / 2 / Cq / hbar
-    wq0 = 1 / np.sqrt(LJ * Cq)
-    wq = 1 / np.sqrt(LJ * Cq) - EC
+    wq0 = 1 / math.sqrt(LJ * Cq)
+    wq = wq0 - EC
 
     # charge dispersion
-    eps1 = EC * 2**9 * (2/np.sqrt(np.pi)) * \
-        (EJ/2/EC)**(1.25) * np.exp(-np.sqrt(8*EJ/EC))
+    eps1 = EC * _EPS1_COEFF * \
+        (EJ/2/EC)**(1.25) * math.exp(-math.sqrt(8*EJ/EC))
 
     return LJ, EJ, Zqp, EC, wq, wq0, eps1
 
@@ -194,6 +211,7 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     Raises:
         ValueError: If N is not positive
         ValueError: If the capacitance matrix is the wrong size
+        ValueError: If fb is a list of fewer than N-1 frequencies
     """
 
     # Error checks
@@ -203,15 +221,15 @@ def extract_transmon_coupled_Noscillator(capMatrix,
         raise ValueError('Capacitance matrix is not the right size')
 
     # make list of angular frequencies of resonators
-    wr = np.zeros(N)  # angular freq of resonators (GHz-rad)
-    for ii in range(N):
-        if ii == 0:  # readout resonator
-            wr[ii] = 2 * np.pi * fr * 1e9
-        else:
-            if isinstance(fb, (int, float)):  # just a single one
-                wr[ii] = 2 * np.pi * fb * 1e9
-            else:
-                wr[ii] = 2 * np.pi * fb[ii - 1] * 1e9  # offset index by
+    # readout resonator first, then the N-1 coupling buses
+    if np.isscalar(fb):  # just a single one
+        fb = np.full(max(N - 1, 0), fb)
+    elif len(fb) < N - 1:
+        raise ValueError(
+            f'fb must have a frequency for each of the N-1={N - 1} '
+            f'coupling buses, got {len(fb)}')
+    freqs = np.concatenate(([fr], np.asarray(fb, dtype=float)[:N - 1]))[:N]
+    wr = 2 * np.pi * freqs * 1e9  # angular freq of resonators (GHz-rad)
 
     ########################################################
     #### Transmission line properties
@@ -226,22 +244,18 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     # same resonance frequency
     # DCM (I think from numerics)
     if not res_L4_corr is None:
-        for i in range(len(res_L4_corr)):
-            if res_L4_corr[i]:
-                Cr[i] /= 2.0
-                Lr[i] *= 2.0
+        is_L4 = np.asarray(res_L4_corr, dtype=bool)
+        Cr[is_L4] /= 2.0
+        Lr[is_L4] *= 2.0
 
     ########################################################
     # Capacitance matrix parsing
 
     ground_index = max([0, N - 1])
     qubit_index = [ground_index + 1, ground_index + 2]
-    bus_index = np.zeros(N, dtype=int)
-    for ii in range(N):
-        if ii == 0:
-            bus_index[ii] = len(capMatrix) - 1
-        else:
-            bus_index[ii] = ii - 1
+    # readout is the last index, then the buses from 0
+    bus_index = np.arange(-1, N - 1)
+    bus_index[:1] = len(capMatrix) - 1
 
     # Cg list of qubit pads to ground
     Cg = [
@@ -252,47 +266,45 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     # Cs qubit pads to each other
     Cs = -capMatrix[qubit_index[0], qubit_index[1]]
 
-    # Cbus (qubit pads to coupling pads)
+    # Cbus (qubit pads to coupling pads), one array per qubit pad
     # index is ordered as [readout,bus1,...]
-    Cbus = np.zeros([2, N])
-    for ii in range(2):
-        for jj in range(N):
-            Cbus[ii, jj] = -capMatrix[qubit_index[ii], bus_index[jj]]
+    Cbus0 = -capMatrix[qubit_index[0], bus_index]
+    Cbus1 = -capMatrix[qubit_index[1], bus_index]
 
     # crosspad capacitance
-    Cbusbus = np.zeros([N, N])
-    for ii in range(N):
-        for jj in range(N):
-            if ii != jj:
-                Cbusbus[ii, jj] = -capMatrix[bus_index[ii], bus_index[jj]]
+    Cbusbus = -capMatrix[np.ix_(bus_index, bus_index)]
+    np.fill_diagonal(Cbusbus, 0)
 
     # sum of capacitances from each pad to ground
     # this assumes the bus couplers are at "ground"
-    C1S = Cg[0] + np.sum(Cbus[0,])
-    C2S = Cg[1] + np.sum(Cbus[1,])
+    C1S = Cg[0] + np.sum(Cbus0)
+    C2S = Cg[1] + np.sum(Cbus1)
+
+    # the two pads to ground in series, shared by the expressions below
+    C12S = C1S + C2S
 
     # total capacitance between pads
-    tCSq = Cs + C1S * C2S / (C1S + C2S)  # Key equation
+    tCSq = Cs + C1S * C2S / C12S  # Key equation
 
     # total capacitance of each pad to ground?
     # Note the + in the squared term below !!!
-    tCSbus = np.zeros(N)
-    for ii in range(N):
-        tCSbus[ii] = Cr[ii] - (Cbus[0, ii]+Cbus[1, ii])**2 / \
-            (C1S+C2S) + np.sum(Cbus[:, ii]) + np.sum(Cbusbus[ii, :])
+    # Accumulated in place, in the order Cr - sum**2/C12S + sum + rowsum
+    Cbus_sum = Cbus0 + Cbus1
+    tCSbus = Cbus_sum**2 / -C12S
+    tCSbus += Cr
+    tCSbus += Cbus_sum
+    tCSbus += np.sum(Cbusbus, axis=1)
 
     # qubit to coupling pad capacitance
-    tCqbus = (C2S * Cbus[0,] - Cbus[1,] * C1S) / (C1S + C2S)
+    Cbus_diff = C2S * Cbus0 - Cbus1 * C1S
+    tCqbus = Cbus_diff / C12S
 
     # coupling pad to coupling pad capacitance
-    tCqbusbus = np.zeros([N, N])
-    for ii in range(N):
-        for jj in range(N):
-            tCqbusbus[ii, jj] = Cbusbus[ii, jj] + \
-                (Cbus[0, ii]+Cbus[1, ii])*(Cbus[0, jj]+Cbus[1, jj])/(C1S+C2S)
+    tCqbusbus = np.outer(Cbus_sum, Cbus_sum) / C12S
+    tCqbusbus += Cbusbus
 
     # voltage division ratio
-    bbus = (C2S * Cbus[0,] - Cbus[1,] * C1S) / ((C1S + C2S) * Cs + C1S * C2S)
+    bbus = Cbus_diff / (C12S * Cs + C1S * C2S)
 
     # total qubit capacitance (including junction capacitance)
     Cq = tCSq + CJ
@@ -331,11 +343,7 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     gbus_in_MHz = gqbus / 1e6 / 2 / np.pi
 
     # g's between pads
-    gbusbus = np.zeros([N, N])
-    for ii in range(N):
-        for jj in range(N):
-            gbusbus[ii,
-                    jj] = (0.01) * tCqbusbus[ii, jj] / (tCSbus[ii] * tCSbus[jj])
+    gbusbus = (0.01) * tCqbusbus / np.outer(tCSbus, tCSbus)
 
     ########################################################
     ##### Purcell, Qs, dissipative
@@ -343,12 +351,8 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     # guesses for the Q's
     Qreadout = 1e4
     Qcouplingbus = 1e5
-    Qbus = np.zeros(N)
-    for ii in range(N):
-        if ii == 0:
-            Qbus[ii] = Qreadout
-        else:
-            Qbus[ii] = Qcouplingbus
+    Qbus = np.full(N, Qcouplingbus)
+    Qbus[:1] = Qreadout
 
     # loss tangent
     kbus = wr / Qbus
@@ -414,84 +418,315 @@ def extract_transmon_coupled_Noscillator(capMatrix,
     return ham_dict
 
 
-def levels_vs_ng_real_units(Cq, IC, N=301, do_disp=0, do_plots=0):
-    """This numerically computes the exact transmon levels given C and IC as a
-    function of the ng ration -- it subtracts the vaccuum flucations so that
-    the groud state is set to zero energy.
+def _transmon_lowest_levels(Ec, EJ, charge, nmax, n_levels, with_terms=False):
+    """Lowest eigenvalues of the transmon Hamiltonian, truncated to the charge
+    states -nmax..nmax, for each of the given offset charges.
+
+    In the charge basis the Hamiltonian is tridiagonal: 4 Ec (n - ng)**2 on
+    the diagonal and -EJ/2 next to it.
 
     Args:
-        C (float): In fF
-        Ic (float): In nA
-        N (int): Number of charge values to use (needs to be odd)
-        do_disp (int): Will print out the values
-        do_plots (int): Will plot the data
+        Ec (float): Charging energy, in J
+        EJ (float): Josephson energy, in J
+        charge (np.ndarray): Offset charges
+        nmax (int): Largest charge state kept
+        n_levels (int): Number of lowest levels to compute
+        with_terms (bool): Also return the expectation values of the two
+            terms of the Hamiltonian in each level.  Defaults to False.
 
     Returns:
-        tuple: fqubitGHz, anharMHz, disp, tphi_ms
+        np.ndarray: Eigenvalues in ascending order, of shape
+        (len(charge), n_levels). With `with_terms`, a tuple of the
+        eigenvalues, the expectation values of the kinetic term, and those of
+        the potential term divided by EJ, all of that shape.
+    """
+    n_vec = np.arange(-nmax, nmax + 1.)
+
+    # PE
+    off_diag = np.full(2 * nmax, -0.5 * EJ)
+
+    if not with_terms:
+        # KE, and only the lowest levels
+        return np.array([
+            eigh_tridiagonal(4 * Ec * (n_vec - ng)**2,
+                             off_diag,
+                             eigvals_only=True,
+                             select='i',
+                             select_range=(0, n_levels - 1),
+                             check_finite=False) for ng in charge
+        ]).reshape(len(charge), n_levels)
+
+    energies = np.empty((len(charge), n_levels))
+    kinetic = np.empty((len(charge), n_levels))
+    potential = np.empty((len(charge), n_levels))
+    for ii, ng in enumerate(charge):
+        kinetic_diag = 4 * Ec * (n_vec - ng)**2
+        energies[ii], states = eigh_tridiagonal(kinetic_diag,
+                                                off_diag,
+                                                select='i',
+                                                select_range=(0, n_levels - 1),
+                                                check_finite=False)
+        kinetic[ii] = kinetic_diag @ states**2
+        potential[ii] = -np.sum(states[:-1] * states[1:], axis=0)
+    return energies, kinetic, potential
+
+
+def _transmon_energies(Cq, IC):
+    """Charging and Josephson energies of a transmon.
+
+    Args:
+        Cq (float): In fF
+        IC (float): In nA
+
+    Returns:
+        tuple: Ec, EJ -- in J
+    """
+    Ec = e**2 / 2 / (Cq * 1e-15)
+    varphi = hbar / 2 / e
+    EJ = IC * 1e-9 * varphi
+    return Ec, EJ
+
+
+def _charge_truncation(Ec, EJ, charge, n_levels, converge_tol=None):
+    """Largest charge state to keep in the charge basis of the transmon.
+
+    By default the charge basis is truncated to |n| <= 40. With
+    `converge_tol`, the truncation starts from an estimate based on EJ/Ec
+    instead, and is widened until the levels at the outermost charge values
+    change by less than `converge_tol`, relative to the largest level. It is
+    not widened past |n| <= 40, or the estimate if that is larger; a
+    RuntimeWarning is issued if the levels have not converged by then.
+
+    Args:
+        Ec (float): Charging energy, in J
+        EJ (float): Josephson energy, in J
+        charge (np.ndarray): Offset charges, in ascending order
+        n_levels (int): Number of lowest levels to converge
+        converge_tol (float): Relative tolerance of the truncation of the
+            charge basis.  Defaults to None, for the fixed truncation.
+
+    Returns:
+        int: nmax
 
     Raises:
-        ValueError: If the matrix is not Hermitian
+        ValueError: If converge_tol is not positive
     """
-    C = Cq * 1e-15
-    IC = IC * 1e-9
-    Ec = e**2 / 2 / C
-
-    nmax = 40
-    dim = 2 * nmax + 1
-    nmat = np.zeros([dim, dim])
-    V = nmat
+    if converge_tol is None:
+        return _NMAX
+
+    if not converge_tol > 0:
+        raise ValueError(f'converge_tol must be positive, got {converge_tol}.')
+    # The charge wavefunctions spread over ~(EJ/Ec)**(1/4) states
+    nmax = max(15, int(3 * np.ceil(abs(EJ / Ec)**0.25)))
+    # Widen up to the fixed truncation, or the estimate if it is larger
+    nmax_cap = max(_NMAX, nmax)
+    # Truncation matters most at the largest offset charges
+    probe = charge[[0, -1]] if len(charge) else charge
+    while probe.size:
+        if nmax >= nmax_cap:
+            warnings.warn(
+                f'The transmon levels did not converge to converge_tol='
+                f'{converge_tol} with the charge basis truncated to '
+                f'|n| <= {nmax}.', RuntimeWarning)
+            break
+        step = min(5, nmax_cap - nmax)
+        small = _transmon_lowest_levels(Ec, EJ, probe, nmax, n_levels)
+        large = _transmon_lowest_levels(Ec, EJ, probe, nmax + step, n_levels)
+        small = small - small[:, :1]
+        large = large - large[:, :1]
+        nmax += step
+        if np.all(
+                np.abs(large - small) <= converge_tol * np.max(np.abs(large))):
+            break
+    return nmax
+
+
+def _transmon_levels_vs_ng(Cq, IC, N, n_levels=3, converge_tol=None):
+    """Numerically computes the exact transmon levels given C and IC as a
+    function of the ng ratio, with the ground state set to zero energy.
+
+    The charge basis is truncated by `_charge_truncation`.
+
+    Args:
+        Cq (float): In fF
+        IC (float): In nA
+        N (int): Number of charge values to use
+        n_levels (int): Number of lowest levels to compute.  Defaults to 3.
+        converge_tol (float): Relative tolerance of the truncation of the
+            charge basis.  Defaults to None, for the fixed truncation.
+
+    Returns:
+        tuple: charge, elvls, Ec, EJ -- elvls has shape (N, n_levels)
+
+    Raises:
+        ValueError: If converge_tol is not positive
+    """
+    Ec, EJ = _transmon_energies(Cq, IC)
     charge = np.linspace(-1., 1., N)
 
-    # KE
-    for ii in range(dim):
-        nmat[ii, ii] = ii - nmax
+    nmax = _charge_truncation(Ec, EJ, charge, n_levels, converge_tol)
+    eigs = _transmon_lowest_levels(Ec, EJ, charge, nmax, n_levels)
+    elvls = eigs - eigs[:, :1]
 
-    # PE
-    V = np.diag(-0.5 * np.ones([dim - 1]), 1)
-    V = (V + np.transpose(np.conj(V)))
+    return charge, elvls, Ec, EJ
 
-    varphi = hbar / 2 / e
-    EJ = IC * varphi
 
-    elvls = np.zeros([dim, N])
+def _levels_freq_and_anharm(elvls):
+    """Mean qubit frequency and anharmonicity of the transmon levels.
+
+    Both are linear in the levels, so this also maps derivatives of the
+    levels to derivatives of the frequency and anharmonicity.
 
-    for iindex in range(N):
-        ng = charge[iindex]
+    Args:
+        elvls (np.ndarray): Energy levels, of shape (N, n_levels), with
+            n_levels >= 3
 
-        H = 4 * Ec * (nmat - ng * np.eye(dim))**2 + EJ * V
+    Returns:
+        tuple: fqubitGHz, anharMHz
+    """
+    fqubitGHz = np.mean(elvls[:, 1] / h / 1e9)
+    anharMHz = np.mean(1000 *
+                       (elvls[:, 2] / h / 1e9 - elvls[:, 0] / h / 1e9 -
+                        2 * elvls[:, 1] / h / 1e9 - elvls[:, 0] / h / 1e9))
+    return fqubitGHz, anharMHz
 
-        if (not np.array_equal(H, np.transpose(np.conj(H)))):
-            raise ValueError('Matrix is not Hermitian')
 
-        [d, v] = np.linalg.eig(H)
-        sortIX = np.argsort(d)
-        sorted_d = d[sortIX]
+def _levels_summary(elvls):
+    """Summarize the transmon levels computed by `_transmon_levels_vs_ng`.
 
-        elvls[:, iindex] = (sorted_d - sorted_d[0])
+    Args:
+        elvls (np.ndarray): Energy levels, of shape (N, n_levels), with
+            n_levels >= 3
 
+    Returns:
+        tuple: fqubitGHz, anharMHz, disp, tphi_ms
+    """
+    fqubitGHz, anharMHz = _levels_freq_and_anharm(elvls)
+
+    disp = np.max(-elvls[:, 1] / h + elvls[0, 1] / h)
+    tphi_ms = 2 / (2 * np.pi * disp * np.pi * 1e-4 * 1e-3)
+
+    return fqubitGHz, anharMHz, disp, tphi_ms
+
+
+@lru_cache(maxsize=2048)
+def _levels_vs_ng_cached(Cq, IC, N, converge_tol=None):
+    """Memoized `_levels_summary` of `_transmon_levels_vs_ng`.
+
+    Sweeps, such as `levels_vs_ng_real_units_batched`, and repeated calls of
+    `levels_vs_ng_real_units` or `cos_to_mega_and_delta` often evaluate the
+    same (Cq, IC), and each evaluation is N eigen-decompositions.
+
+    Args:
+        Cq (float): In fF
+        IC (float): In nA
+        N (int): Number of charge values to use
+        converge_tol (float): Relative tolerance of the truncation of the
+            charge basis.  Defaults to None.
+
+    Returns:
+        tuple: fqubitGHz, anharMHz, disp, tphi_ms
+    """
+    _, elvls, _, _ = _transmon_levels_vs_ng(Cq,
+                                            IC,
+                                            N,
+                                            converge_tol=converge_tol)
+    return _levels_summary(elvls)
+
+
+def _levels_and_gradient_vs_ng(Cq, IC, N, converge_tol=None):
+    """Lowest three transmon levels as a function of ng, and their derivatives
+    with respect to Cq and IC.
+
+    The levels are those of `_transmon_levels_vs_ng`. The derivatives follow
+    from the Hellmann-Feynman theorem, dE_k/dx = <k|dH/dx|k>, where only the
+    kinetic term of H depends on Cq and only the potential term depends on
+    IC.
+
+    Args:
+        Cq (float): In fF
+        IC (float): In nA
+        N (int): Number of charge values to use
+        converge_tol (float): Relative tolerance of the truncation of the
+            charge basis.  Defaults to None, for the fixed truncation.
+
+    Returns:
+        tuple: elvls, d_elvls_dCq, d_elvls_dIC -- each of shape (N, 3), with
+        the ground state set to zero
+    """
+    Ec, EJ = _transmon_energies(Cq, IC)
+    charge = np.linspace(-1., 1., N)
+
+    nmax = _charge_truncation(Ec, EJ, charge, 3, converge_tol)
+    energies, kinetic, potential = _transmon_lowest_levels(Ec,
+                                                           EJ,
+                                                           charge,
+                                                           nmax,
+                                                           3,
+                                                           with_terms=True)
+
+    # dH/dCq = -KE / Cq and dH/dIC = 1e-9 * varphi * PE / EJ
+    d_dCq = -kinetic / Cq
+    d_dIC = 1e-9 * hbar / 2 / e * potential
+
+    return tuple(levels - levels[:, :1] for levels in (energies, d_dCq, d_dIC))
+
+
+def levels_vs_ng_real_units(Cq,
+                            IC,
+                            N=301,
+                            do_disp=0,
+                            do_plots=0,
+                            converge_tol=1e-10):
+    """This numerically computes the exact transmon levels given C and IC as a
+    function of the ng ration -- it subtracts the vaccuum flucations so that
+    the groud state is set to zero energy.
+
+    Results are cached, unless the data is plotted.
+
+    Args:
+        C (float): In fF
+        Ic (float): In nA
+        N (int): Number of charge values to use (needs to be odd)
+        do_disp (int): Will print out the values
+        do_plots (int): Will plot the data
+        converge_tol (float): The charge basis is truncated as much as this
+            relative tolerance on the levels allows.  None keeps 81 charge
+            states.  Defaults to 1e-10.
+
+    Returns:
+        tuple: fqubitGHz, anharMHz, disp, tphi_ms
+
+    Raises:
+        ValueError: If N is negative, or converge_tol is not positive
+    """
     if do_plots:
+        charge, elvls, Ec, EJ = _transmon_levels_vs_ng(
+            Cq, IC, N, n_levels=4, converge_tol=converge_tol)
 
         # plot using matplotlib (might need to clean this up)
+        # imported here, since it is slow to import and only needed to plot
+        import matplotlib.pyplot as plt
 
         plt.figure()
         plt.subplot(1, 2, 1)
         plt.plot(charge,
-                 elvls[0,] / h / 1e9,
+                 elvls[:, 0] / h / 1e9,
                  'k',
                  charge,
-                 elvls[1,] / h / 1e9,
+                 elvls[:, 1] / h / 1e9,
                  'b',
                  charge,
-                 elvls[2,] / h / 1e9,
+                 elvls[:, 2] / h / 1e9,
                  'r',
                  charge,
-                 elvls[3,] / h / 1e9,
+                 elvls[:, 3] / h / 1e9,
                  'g',
                  LineWidth=2)
         plt.xlabel('Gate charge, n_g [2e]')
         plt.ylabel('Energy, E_n [GHz]')
         plt.subplot(1, 2, 2)
-        plt.plot(charge, (-elvls[1, :] / h + elvls[1, 0] / h) / 1e3, 'k')
+        plt.plot(charge, (-elvls[:, 1] / h + elvls[0, 1] / h) / 1e3, 'k')
         plt.xlabel('Gate charge, n_g [2e]')
         plt.ylabel('Energy [kHz], ')
         plt.show()
@@ -499,26 +734,25 @@ def levels_vs_ng_real_units(Cq, IC, N=301, do_disp=0, do_plots=0):
         plt.figure(2)
         plt.subplot(1, 2, 1)
         plt.plot(
-            charge, 1000 * (elvls[2,] / h / 1e9 - elvls[0,] / h / 1e9 -
-                            2 * elvls[1,] / h / 1e9 - elvls[0,] / h / 1e9),
+            charge, 1000 * (elvls[:, 2] / h / 1e9 - elvls[:, 0] / h / 1e9 -
+                            2 * elvls[:, 1] / h / 1e9 - elvls[:, 0] / h / 1e9),
             charge, -charge * 0 - 1000 * Ec / h / 1e9)
         plt.xlabel('Gate charge, n_g [2e]')
         plt.ylabel('delta [MHZ] green theory, blue numerics ')
         plt.subplot(1, 2, 2)
-        plt.plot(charge, elvls[1,] / h / 1e9 - elvls[0,] / h / 1e9, charge,
+        plt.plot(charge, elvls[:, 1] / h / 1e9 - elvls[:, 0] / h / 1e9, charge,
                  charge * 0 + (np.sqrt(8 * EJ * Ec) - Ec) / h / 1e9)
         plt.xlabel('Gate charge, n_g [2e]')
         plt.ylabel('F01 [GHZ] green theory, blue numerics ')
         plt.show()
 
-    fqubitGHz = np.mean(elvls[1,] / h / 1e9)
-    anharMHz = np.mean(1000 * (elvls[2,] / h / 1e9 - elvls[0,] / h / 1e9 -
-                               2 * elvls[1,] / h / 1e9 - elvls[0,] / h / 1e9))
-
-    disp = np.max(-elvls[1,] / h + elvls[1, 0] / h)
-    tphi_ms = 2 / (2 * np.pi * disp * np.pi * 1e-4 * 1e-3)
+        fqubitGHz, anharMHz, disp, tphi_ms = _levels_summary(elvls)
+    else:
+        fqubitGHz, anharMHz, disp, tphi_ms = _levels_vs_ng_cached(
+            Cq, IC, N, converge_tol)
 
     if do_disp:
+        Ec = e**2 / 2 / (Cq * 1e-15)
         print('Mean Frequency %f [GHz]' % fqubitGHz)
         print('Anharmonicity %f [MHz]' % anharMHz)
         print('EC %f [GHz]' % (Ec / h / 1e9))
@@ -528,6 +762,36 @@ def levels_vs_ng_real_units(Cq, IC, N=301, do_disp=0, do_plots=0):
     return fqubitGHz, anharMHz, disp, tphi_ms
 
 
+def levels_vs_ng_real_units_batched(Cq, IC, N=51, converge_tol=1e-10):
+    """`levels_vs_ng_real_units` for many (Cq, IC) designs, as in a parameter
+    sweep.
+
+    Each design is a tridiagonal eigenproblem per charge value, which is
+    cheaper to solve on its own than as part of a stack of dense matrices.
+    The results of each design are cached as in `levels_vs_ng_real_units`.
+
+    Args:
+        Cq (np.ndarray): In fF
+        IC (np.ndarray): In nA, broadcast against Cq
+        N (int): Number of charge values to use (needs to be odd)
+        converge_tol (float): See `levels_vs_ng_real_units`.
+            Defaults to 1e-10.
+
+    Returns:
+        tuple: fqubitGHz, anharMHz, disp, tphi_ms -- arrays with the
+        broadcast shape of Cq and IC
+    """
+    Cq, IC = np.broadcast_arrays(np.asarray(Cq, dtype=float),
+                                 np.asarray(IC, dtype=float))
+
+    summary = np.array([
+        _levels_vs_ng_cached(Cq_i, IC_i, N, converge_tol)
+        for Cq_i, IC_i in zip(Cq.ravel().tolist(),
+                              IC.ravel().tolist())
+    ]).reshape(Cq.shape + (4,))
+    return tuple(summary[..., ii] for ii in range(4))
+
+
 def get_C_and_Ic(Cin_est, Icin_est, f01, f02on2):
     """Get the capacitance and critical current for a transmon of a certain
     frequency and anharmonicity.
@@ -543,8 +807,11 @@ def get_C_and_Ic(Cin_est, Icin_est, f01, f02on2):
         specified frequency and anharmonicity
     """
 
-    xrr = opt.minimize(lambda x: cos_to_mega_and_delta(x[0], x[1], f01, f02on2),
-                       [Cin_est, Icin_est],
+    def cost_and_grad(x):
+        return _cos_to_mega_and_delta_and_grad(x[0], x[1], f01, f02on2)
+
+    xrr = opt.minimize(cost_and_grad, [Cin_est, Icin_est],
+                       jac=True,
                        tol=1e-4,
                        options={
                            'maxiter': 100,
@@ -583,6 +850,41 @@ def cos_to_mega_and_delta(Cin, ICin, f01, f02on2):
             (fqubitGHz + anharMHz / 2. / 1e3 - f02on2)**2)**0.5
 
 
+def _cos_to_mega_and_delta_and_grad(Cin, ICin, f01, f02on2):
+    """`cos_to_mega_and_delta` together with its analytic gradient with
+    respect to (Cin, ICin), for use with ``scipy.optimize.minimize(jac=True)``.
+
+    Args:
+        Cin (float): Cin
+        ICin (float): ICin
+        f01 (float): f01
+        f02on2 (float): f02on2
+
+    Returns:
+        tuple: Calculated value, gradient array
+    """
+    # Same levels as cos_to_mega_and_delta, through levels_vs_ng_real_units
+    elvls, d_dCq, d_dIC = _levels_and_gradient_vs_ng(Cin,
+                                                     ICin,
+                                                     N=51,
+                                                     converge_tol=1e-10)
+
+    fqubitGHz, anharMHz = _levels_freq_and_anharm(elvls)
+    # Both are linear in the levels, so their derivatives are as well
+    d_fq, d_anhar = np.array(
+        [_levels_freq_and_anharm(d_dCq),
+         _levels_freq_and_anharm(d_dIC)]).T
+
+    r1 = fqubitGHz - f01
+    r2 = fqubitGHz + anharMHz / 2. / 1e3 - f02on2
+    cost = (r1**2 + r2**2)**0.5
+    if cost == 0:
+        return cost, np.zeros(2)
+
+    grad = (r1 * d_fq + r2 * (d_fq + d_anhar / 2. / 1e3)) / cost
+    return cost, grad
+
+
 # TODO: Move to a more generic file
 
 
@@ -598,18 +900,95 @@ def chargeline_T1(Ccharge, Cq, f01):
         float: Calculated chargeline T1
     """
 
-    return Cq / (Ccharge**2 * 50. * (2 * np.pi * f01)**2)
+    return Cq / (Ccharge**2 * 50. * (2 * math.pi * f01)**2)
 
 
 # TODO: Move to a more generic file
 
 
+def _parse_q3d_table(text: str) -> pd.DataFrame:
+    """Parse a whitespace delimited matrix exported by Ansys Q3D: a header
+    line with the column names, then one line per row, starting with the row
+    name.
+
+    The tables are small, so splitting the lines directly is much cheaper
+    than setting up the pandas csv parser.
+
+    Args:
+        text (str): Text of the table
+
+    Returns:
+        pd.DataFrame: The matrix
+    """
+    lines = text.strip().splitlines()
+    columns = lines[0].split()
+    rows = [line.split() for line in lines[1:] if line.strip()]
+    values = np.array([row[1:] for row in rows], dtype=np.float64)
+    return pd.DataFrame(values.reshape(len(rows), len(columns)),
+                        index=[row[0] for row in rows],
+                        columns=columns)
+
+
+@lru_cache(maxsize=128)
+def _readin_q3d_matrix_cached(path: str, mtime_ns: int, delim_whitespace):
+    """Memoized body of `readin_q3d_matrix`.
+
+    Args:
+        path (str): Path to file
+        mtime_ns (int): Modification time of the file, so that the cache
+            is not used once the file changes
+        delim_whitespace (bool): See `readin_q3d_matrix`
+
+    Returns:
+        tuple: df_cmat, units, design_variation, df_cond
+    """
+    text = Path(path).read_text()
+
+    s1 = text.split('Capacitance Matrix')
+    assert len(s1) == 2, "Copuld not split text to `Capacitance Matrix`"
+
+    s2 = s1[1].split('Conductance Matrix')
+
+    if delim_whitespace:
+        df_cmat = _parse_q3d_table(s2[0])
+        df_cond = _parse_q3d_table(s2[1]) if len(s2) > 1 else None
+    else:
+        df_cmat = pd.read_csv(io.StringIO(s2[0].strip()),
+                              skipinitialspace=True,
+                              index_col=0)
+        if len(s2) > 1:
+            df_cond = pd.read_csv(io.StringIO(s2[1].strip()),
+                                  skipinitialspace=True,
+                                  index_col=0)
+        else:
+            df_cond = None
+
+    if delim_whitespace == False and len(df_cmat.columns):
+        df_cmat = df_cmat.drop(df_cmat.columns[-1], axis=1)
+
+    units = _RE_C_UNITS.findall(text)[0]
+    design_variation = _RE_DESIGN_VARIATION.findall(text)
+    if len(design_variation) == 0:
+        design_variation = _RE_DESIGN_VARIATION_SPACED.findall(text)
+        if design_variation:
+            design_variation = design_variation[0]
+        else:
+            design_variation = ''
+    else:
+        design_variation = design_variation[0]
+
+    return df_cmat, units, design_variation, df_cond
+
+
 def readin_q3d_matrix(path: str, delim_whitespace=True):
     """Read in the txt file created from q3d export as CSV and output the
     capacitance matrix file exported by Ansys Q3D.
 
     When exporting pick "save as type: data table"
 
+    Files are parsed once per modification time; each call returns fresh
+    copies of the DataFrames.
+
     Args:
         path (str): Path to file
 
@@ -646,40 +1025,15 @@ def readin_q3d_matrix(path: str, delim_whitespace=True):
         Q1_readout_connector_pad        0       0       0       0       0       0
     """
 
-    text = Path(path).read_text()
-
-    s1 = text.split('Capacitance Matrix')
-    assert len(s1) == 2, "Copuld not split text to `Capacitance Matrix`"
+    path = Path(path)
+    df_cmat, units, design_variation, df_cond = _readin_q3d_matrix_cached(
+        str(path),
+        path.stat().st_mtime_ns, delim_whitespace)
 
-    s2 = s1[1].split('Conductance Matrix')
-
-    df_cmat = pd.read_csv(io.StringIO(s2[0].strip()),
-                          delim_whitespace=delim_whitespace,
-                          skipinitialspace=True,
-                          index_col=0)
-    if len(s2) > 1:
-        df_cond = pd.read_csv(io.StringIO(s2[1].strip()),
-                              delim_whitespace=delim_whitespace,
-                              skipinitialspace=True,
-                              index_col=0)
-    else:
-        df_cond = None
-
-    if delim_whitespace == False and len(df_cmat.columns):
-        df_cmat = df_cmat.drop(df_cmat.columns[-1], axis=1)
-
-    units = re.findall(r'C Units:(.*?),', text)[0]
-    design_variation = re.findall(r'DesignVariation:(.*?)\n', text)
-    if len(design_variation) == 0:
-        design_variation = re.findall(r'Design Variation:(.*?)\n', text)
-        if design_variation:
-            design_variation = design_variation[0]
-        else:
-            design_variation = ''
-    else:
-        design_variation = design_variation[0]
-
-    return df_cmat, units, design_variation, df_cond
+    # The cached DataFrames are shared, so hand out copies
+    if df_cond is not None:
+        df_cond = df_cond.copy()
+    return df_cmat.copy(), units, design_variation, df_cond
 
 
 def readin_q3d_matrix_m(path: str) -> pd.DataFrame:
@@ -692,7 +1046,7 @@ def readin_q3d_matrix_m(path: str) -> pd.DataFrame:
         pd.DataFrame of cap matrix, with no names of columns.
     """
     text = Path(path).read_text()
-    match = re.findall(r'capMatrix (.*?)]', text, re.DOTALL)
+    match = _RE_CAP_MATRIX.findall(text)
     if match:
         match = match[0].strip('= [').strip(']').strip('\n')
         dfC = pd.read_csv(io.StringIO(match),
@@ -704,6 +1058,27 @@ def readin_q3d_matrix_m(path: str) -> pd.DataFrame:
 # TODO: Move to a more generic file
 
 
+@lru_cache(maxsize=1)
+def _unit_registry() -> UnitRegistry:
+    """The pint unit registry, created on first use since it is slow to
+    build."""
+    return UnitRegistry()
+
+
+@lru_cache(maxsize=64)
+def _unit_scale(units: str, user_units: str) -> float:
+    """Factor that converts a quantity from `units` to `user_units`.
+
+    Args:
+        units (str): Units to convert from, such as 'farad'
+        user_units (str): Units to convert to, such as 'fF'
+
+    Returns:
+        float: The conversion factor
+    """
+    return _unit_registry().parse_expression(units).to(user_units).magnitude
+
+
 def load_q3d_capacitance_matrix(path, user_units='fF', _disp=True):
     """Load Q3D capcitance file exported as Maxwell matrix. Do not export
     conductance. Units are read in automatically and converted to user units.
@@ -719,9 +1094,7 @@ def load_q3d_capacitance_matrix(path, user_units='fF', _disp=True):
     df_cmat, Cunits, design_variation, df_cond = readin_q3d_matrix(path)
 
     # Unit convert
-    ureg = UnitRegistry()
-    q = ureg.parse_expression(Cunits).to(user_units)
-    df_cmat = df_cmat * q.magnitude  # scale to user units
+    df_cmat = df_cmat * _unit_scale(Cunits, user_units)  # scale to user units
 
     # Report
     if _disp:
@@ -751,7 +1124,8 @@ def move_index_to(i_from: List[int], i_to: List[int], len_):
     """Utility function to swap index.
 
     Arguments:
-        i_from (int): Data frame to swap index
+        i_from (int or List[int]): Data frame to swap index.  A list
+            deletes each of its indices, as in np.delete.
         i_to (int): Data frame to index
         len_ (int): Length of array
 
@@ -759,7 +1133,14 @@ def move_index_to(i_from: List[int], i_to: List[int], len_):
         list: list of indecies, such as  array([1, 2, 3, 4, 0, 5])
     """
     idxs = np.arange(0, len_)
-    idxs = np.delete(idxs, i_from)
+    if isinstance(i_from, (int, np.integer)) and i_from >= 0:
+        # Slicing is cheaper than np.delete, which handles the other cases
+        if i_from >= len(idxs):
+            raise IndexError(f'index {i_from} is out of bounds for axis 0 '
+                             f'with size {len(idxs)}')
+        idxs = np.concatenate((idxs[:i_from], idxs[i_from + 1:]))
+    else:
+        idxs = np.delete(idxs, i_from)
     return np.insert(idxs, i_to, i_from)
 
 
@@ -779,6 +1160,6 @@ def df_reorder_matrix_basis(df, i_from, i_to):
     """
     arr = df.values
     idx = move_index_to(i_from, i_to, len(arr))
-    arr = arr[np.ix_(idx, idx)]
+    arr = arr.take(idx, axis=0).take(idx, axis=1)
     # Maybe make copy
     return pd.DataFrame(arr, columns=df.columns[idx], index=df.index[idx])
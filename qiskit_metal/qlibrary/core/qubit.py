@@ -17,6 +17,31 @@ from qiskit_metal.toolbox_python.attr_dict import Dict
 from .base import QComponent
 
 
+def _fast_clone_dict(options: dict) -> dict:
+    """Copy a tree of option dictionaries, such as the default connection
+    pads of a qubit.
+
+    Option templates are nested dictionaries of strings and numbers, so
+    rebuilding the dictionaries is enough, and much cheaper than `deepcopy`.
+    Any other value is still deep copied.
+
+    Args:
+        options (dict): The dictionary to copy.
+
+    Returns:
+        dict: A copy of the same type as `options`.
+    """
+    clone = type(options)()
+    for key, value in options.items():
+        if isinstance(value, dict):
+            clone[key] = _fast_clone_dict(value)
+        elif value is None or isinstance(value, (str, int, float)):
+            clone[key] = value
+        else:
+            clone[key] = deepcopy(value)
+    return clone
+
+
 class BaseQubit(QComponent):
     """Qubit base class. Use to subscript, not to generate directly.
 
@@ -70,7 +95,7 @@ class BaseQubit(QComponent):
             # This qubit was not added to design.
             # self.logger.warning(
             # 'In BaseQubit.__init(), the qubit has not been added to design. The component is exiting with None.')
-            return None
+            return
         if options_connection_pads:
             self.options.connection_pads.update(options_connection_pads)
 
@@ -86,8 +111,10 @@ class BaseQubit(QComponent):
     def _set_options_connection_pads(self):
         """Applies the default options."""
         # class_name = type(self).__name__
-        assert '_default_connection_pads' in self.design.template_options[
-            self.class_name], f"""When
+        # Resolved once; the template belongs to this design, and may be
+        # replaced when the class is reloaded, so it is not cached further.
+        template = self.design.template_options[self.class_name]
+        assert '_default_connection_pads' in template, f"""When
         you define your custom qubit class please add a _default_connection_pads
         dictionary name as default_options['_default_connection_pads']. This should specify the default
         creation options for the connection. """
@@ -96,10 +123,11 @@ class BaseQubit(QComponent):
         del self.options._default_connection_pads
         # the self.options cleaner or not, since the options currently copies in the template. This is
         # potential source of bugs in the future
-        for name in self.options.connection_pads:
-            my_options_connection_pads = self.options.connection_pads[name]
-            self.options.connection_pads[name] = deepcopy(
-                self.design.template_options[
-                    self.class_name]['_default_connection_pads'])
-            self.options.connection_pads[name].update(
-                my_options_connection_pads)
+        default_pads = template['_default_connection_pads']
+        connection_pads = self.options.connection_pads
+        for name, my_options_connection_pads in connection_pads.items():
+            pad_options = _fast_clone_dict(default_pads)
+            pad_options.update(my_options_connection_pads)
+            # Replaces the value of an existing key, which is safe while
+            # iterating
+            connection_pads[name] = pad_options
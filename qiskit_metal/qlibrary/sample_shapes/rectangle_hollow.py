@@ -12,8 +12,36 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+import math
+from functools import lru_cache
+
 from qiskit_metal import draw, Dict
 from qiskit_metal.qlibrary.core import QComponent
+import numpy as np
+
+# Closed ring of the corners of a unit square centered on the origin
+_UNIT_SQUARE = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5),
+                         (-0.5, -0.5)])
+
+
+@lru_cache(maxsize=128)
+def _rotation_matrix(degrees: float) -> np.ndarray:
+    """Counter-clockwise rotation matrix of the given angle in degrees.
+
+    Cached, since a design usually uses only a few angles. The returned array
+    is shared, so it is read-only.
+    """
+    angle = math.radians(degrees)
+    cos, sin = math.cos(angle), math.sin(angle)
+    matrix = np.array([[cos, -sin], [sin, cos]])
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _map_unit_square(linear: np.ndarray, translation: np.ndarray) -> np.ndarray:
+    """Closed ring of the corners of the unit square, mapped by the affine map
+    x -> linear @ x + translation."""
+    return _UNIT_SQUARE @ linear.T + translation
 
 
 class RectangleHollow(QComponent):
@@ -61,15 +89,44 @@ class RectangleHollow(QComponent):
         qcomponent.add_qgeometry(...), adding in extra needed information, such
         as layer, subtract, etc."""
         p = self.p  # p for parsed parameters. Access to the parsed options.
+        # Every access to p parses the option again, so read each one once
+        inner = p.inner
+        pos = np.array([p.pos_x, p.pos_y])
 
         # create the geometry
-        rect = draw.rectangle(p.width, p.height, p.pos_x, p.pos_y)
-        rec1 = draw.rectangle(p.inner.width, p.inner.height,
-                              p.pos_x + p.inner.offset_x,
-                              p.pos_y + p.inner.offset_y)
-        rec1 = draw.rotate(rec1, p.inner.rotation)
-        rect = draw.subtract(rect, rec1)
-        rect = draw.rotate(rect, p.rotation)
+        # Each rectangle is the unit square, scaled, rotated and moved in
+        # place by a single affine map. The inner one is rotated about its
+        # own center, and offset from pos.
+        size = np.array([p.width, p.height])
+        inner_size = np.array([inner.width, inner.height])
+        offset = np.array([inner.offset_x, inner.offset_y])
+        inner_rotation = _rotation_matrix(inner.rotation)
+
+        # The whole shape is rotated about the center of its bounding box.
+        # That is pos, unless the hole cuts away a full side of the outer
+        # rectangle, which it cannot do when it lies strictly within its
+        # width or height. Then the rotation is folded into the maps of both
+        # rectangles, instead of rotating the hollow rectangle after the
+        # subtraction.
+        half = np.abs(size) / 2
+        hole_half = np.abs(inner_rotation) @ np.abs(inner_size) / 2
+        distance = np.abs(offset)
+        if not inner_size.all() or (distance - hole_half > half).any():
+            # The hole is empty, or its bounding box is clear of the outer
+            # rectangle, so there is nothing to subtract
+            rotation = _rotation_matrix(p.rotation)
+            rect = draw.Polygon(_map_unit_square(rotation * size, pos))
+        elif (distance + hole_half < half).any():
+            rotation = _rotation_matrix(p.rotation)
+            outer = _map_unit_square(rotation * size, pos)
+            hole = _map_unit_square((rotation @ inner_rotation) * inner_size,
+                                    rotation @ offset + pos)
+            rect = draw.subtract(draw.Polygon(outer), draw.Polygon(hole))
+        else:
+            outer = _map_unit_square(np.diag(size), pos)
+            hole = _map_unit_square(inner_rotation * inner_size, offset + pos)
+            rect = draw.subtract(draw.Polygon(outer), draw.Polygon(hole))
+            rect = draw.rotate(rect, p.rotation)
 
         # add qgeometry
         self.add_qgeometry('poly', {'rect': rect},
@@ -247,6 +247,28 @@ class TestAnalyses(unittest.TestCase, AssertionsMixin):
         for x, _ in enumerate(expected):
             self.assertAlmostEqual(_, result[x])
 
+    def test_analyses_lumped_transmon_props_charge_dispersion(self):
+        """Test the charge dispersion of transmon_props for a realistic
+        transmon, where eps1 is not negligible."""
+        # Ic = 30 nA, Cq = 65 fF, so EJ/EC is close to 50
+        expected = (1.0965775579031592e-08, 93584884605.56628,
+                    410.73621666150785, 1872411270.8093133, 35583782657.40719,
+                    37456193928.2165, 88429.05318558427)
+
+        result = lumped_capacitive.transmon_props(30e-9, 65e-15)
+
+        self.assertEqual(len(expected), len(result))
+        for x, _ in enumerate(expected):
+            self.assertAlmostEqualRel(_, result[x], rel_tol=1e-9)
+
+        # Koch et al. eq. (2.5) for m = 1
+        _, EJ, _, EC, _, _, eps1 = result
+        self.assertAlmostEqualRel(2**9 * np.sqrt(2 / np.pi) * EC *
+                                  (EJ / 2 / EC)**1.25 *
+                                  np.exp(-np.sqrt(8 * EJ / EC)),
+                                  eps1,
+                                  rel_tol=1e-12)
+
     def test_analyses_lumped_chi(self):
         """Test the functionality of chi in lumped_capacitives.py."""
         # Generate actual result data
@@ -304,6 +326,62 @@ class TestAnalyses(unittest.TestCase, AssertionsMixin):
         with self.assertRaises(ValueError):
             lumped_capacitive.levels_vs_ng_real_units(100, 100, N=-10)
 
+    def test_analyses_lumped_levels_vs_ng_real_units_converge_tol(self):
+        """Test the converge_tol argument of levels_vs_ng_real_units in
+        lumped_capacitives.py."""
+        for c_q, i_c in [(65, 20), (0.1, 0.1)]:
+            # Generate actual result data
+            fixed = lumped_capacitive.levels_vs_ng_real_units(c_q,
+                                                              i_c,
+                                                              N=51,
+                                                              converge_tol=None)
+            adaptive = lumped_capacitive.levels_vs_ng_real_units(
+                c_q, i_c, N=51, converge_tol=1e-10)
+
+            # A tolerance too tight to reach stops at the fixed truncation
+            with self.assertWarns(RuntimeWarning):
+                tight = lumped_capacitive.levels_vs_ng_real_units(
+                    c_q, i_c, N=51, converge_tol=1e-15)
+
+            # Test all elements of the result data against expected data
+            self.assertIterableAlmostEqual(fixed[:2],
+                                           adaptive[:2],
+                                           rel_tol=1e-9)
+            self.assertIterableAlmostEqual(fixed, tight, rel_tol=1e-12)
+
+        for converge_tol in [0, -1e-10]:
+            with self.assertRaises(ValueError):
+                lumped_capacitive.levels_vs_ng_real_units(
+                    65, 20, N=51, converge_tol=converge_tol)
+
+    def test_analyses_lumped_levels_vs_ng_real_units_batched(self):
+        """Test the functionality of levels_vs_ng_real_units_batched in
+        lumped_capacitives.py."""
+        c_q = np.array([[60.], [65.]])
+        i_c = np.array([20., 25., 30.])
+
+        # Generate actual result data
+        result = lumped_capacitive.levels_vs_ng_real_units_batched(c_q, i_c)
+        scalar = lumped_capacitive.levels_vs_ng_real_units_batched(65., 20.)
+
+        # Test all elements of the result data against expected data
+        self.assertEqual(len(result), 4)
+        for values in result:
+            self.assertEqual(values.shape, (2, 3))
+        for i, j in np.ndindex(2, 3):
+            expected = lumped_capacitive.levels_vs_ng_real_units(c_q[i, 0],
+                                                                 i_c[j],
+                                                                 N=51)
+            self.assertIterableAlmostEqual(expected,
+                                           [values[i, j] for values in result])
+
+        self.assertEqual(len(scalar), 4)
+        for values in scalar:
+            self.assertEqual(values.shape, ())
+        self.assertIterableAlmostEqual(
+            lumped_capacitive.levels_vs_ng_real_units(65., 20., N=51),
+            [float(values) for values in scalar])
+
     def test_analyses_lumped_get_c_and_ic(self):
         """Test the functionality of get_C_and_Ic in lumped_capacitives.py."""
         # Setup expected test results
@@ -635,9 +713,20 @@ class TestAnalyses(unittest.TestCase, AssertionsMixin):
         self.assertTrue(np.array_equal(test_b_expected, test_b_result))
         self.assertTrue(np.array_equal(test_c_expected, test_c_result))
 
+        # Lists and negative indices are handled as by np.delete and np.insert
+        self.assertTrue(
+            np.array_equal([1, 0, 2, 3, 4, 5],
+                           lumped_capacitive.move_index_to([1], 0, 6)))
+        self.assertTrue(
+            np.array_equal([-1, 0, 1, 2, 3],
+                           lumped_capacitive.move_index_to(-1, 0, 5)))
+
         with self.assertRaises(IndexError):
             lumped_capacitive.move_index_to(3, 1, -5)
 
+        with self.assertRaises(IndexError):
+            lumped_capacitive.move_index_to(5, 1, 5)
+
         with self.assertRaises(TypeError):
             lumped_capacitive.move_index_to(3, 1.5, 5)
 
@@ -19,7 +19,14 @@
 Test a planar design and launching the GUI.
 """
 
+import os
 import unittest
+from types import SimpleNamespace
+
+from PySide2.QtWidgets import QApplication
+
+from qiskit_metal._gui.widgets.all_components.table_model_all_components import QTableModel_AllComponents
+from qiskit_metal._gui.widgets.all_components.table_view_all_components import QTableView_AllComponents
 from qiskit_metal._gui.widgets.bases.dict_tree_base import BranchNode
 from qiskit_metal._gui.widgets.bases.dict_tree_base import LeafNode
 
@@ -51,6 +58,76 @@ class TestGUIBasic(unittest.TestCase):
             message = "LeafNode instantiation failed"
             self.fail(message)
 
+    def test_table_model_all_components_refresh_auto(self):
+        """Test refresh_auto in table_model_all_components.py."""
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        _ = QApplication.instance() or QApplication([])
+
+        def component(name, status='good'):
+            return SimpleNamespace(name=name, status=status, id=name)
+
+        design = SimpleNamespace(
+            components={name: component(name) for name in 'abc'})
+        view = QTableView_AllComponents(None)
+        model = QTableModel_AllComponents(SimpleNamespace(design=design),
+                                          logger=None,
+                                          tableView=view)
+        view.setModel(model)
+        view.show()
+
+        events = []
+        model.rowsInserted.connect(lambda _, first, last: events.append(
+            ('insert', first, last)))
+        model.rowsRemoved.connect(lambda _, first, last: events.append(
+            ('remove', first, last)))
+        model.dataChanged.connect(lambda top, bottom, *_: events.append(
+            ('change', top.row(), bottom.row())))
+        model.modelReset.connect(lambda: events.append(('reset',)))
+
+        def check(names, expected_events):
+            model.refresh_auto()
+            self.assertEqual(model.rowCount(), len(names))
+            self.assertEqual(model._component_names, names)
+            self.assertEqual(
+                [model.data(model.index(row, 0)) for row in range(len(names))],
+                names)
+            self.assertEqual(events, expected_events)
+            events.clear()
+
+        # nothing changed
+        check(['a', 'b', 'c'], [])
+
+        # appended
+        design.components.update(d=component('d'), e=component('e'))
+        check(['a', 'b', 'c', 'd', 'e'], [('insert', 3, 4)])
+
+        # non-contiguous removals, last one first
+        del design.components['b'], design.components['d']
+        check(['a', 'c', 'e'], [('remove', 3, 3), ('remove', 1, 1)])
+
+        # renamed in place
+        design.components = {('f' if name == 'c' else name): value
+                             for name, value in design.components.items()}
+        design.components['f'].name = 'f'
+        check(['a', 'f', 'e'], [('change', 1, 1)])
+
+        # rebuilt, with a new build status
+        design.components['e'].status = 'failed'
+        check(['a', 'f', 'e'], [('change', 2, 2)])
+        self.assertEqual(model.data(model.index(2, 3)), 'failed')
+
+        # reordered, updated in place
+        design.components = {
+            name: design.components[name] for name in ['e', 'a', 'f']
+        }
+        check(['e', 'a', 'f'], [('change', 0, 2)])
+
+        # inserted before existing rows, falls back to a reset
+        design.components = dict(g=component('g'), **design.components)
+        check(['g', 'e', 'a', 'f'], [('reset',)])
+
+        view.close()
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
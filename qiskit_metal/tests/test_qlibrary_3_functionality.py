@@ -46,6 +46,7 @@ from qiskit_metal.qlibrary.qubits import transmon_cross
 from qiskit_metal.qlibrary.qubits import transmon_cross_fl
 from qiskit_metal.qlibrary.qubits import transmon_pocket_6
 from qiskit_metal.qlibrary.couplers import tunable_coupler_01
+from qiskit_metal.qlibrary.sample_shapes.rectangle_hollow import RectangleHollow
 from qiskit_metal.tests.assertions import AssertionsMixin
 
 #pylint: disable-msg=line-too-long
@@ -461,6 +462,44 @@ class TestComponentFunctionality(unittest.TestCase, AssertionsMixin):
             for y in range(sub_length):
                 self.assertEqual(actual[x].bounds[y], expected[x][y])
 
+    def test_qlibrary_rectangle_hollow_geometry(self):
+        """Test the geometry made by make in rectangle_hollow.py."""
+        design = designs.DesignPlanar()
+        # name: (inner options, area, bounds, number of interiors)
+        expected = {
+            # hole within the outer rectangle, default inner options
+            'folded': ({}, 0.125, (-0.15, -0.25, 0.15, 0.25), 1),
+            # zero-width hole, nothing to subtract
+            'empty': ({
+                'width': '0um'
+            }, 0.15, (-0.15, -0.25, 0.15, 0.25), 0),
+            # hole clear of the outer rectangle
+            'disjoint': ({
+                'offset_x': '1mm'
+            }, 0.15, (-0.15, -0.25, 0.15, 0.25), 0),
+            # hole cutting the full right side, which moves the center of
+            # the bounding box the whole shape is rotated about
+            'side': ({
+                'width': '600um',
+                'height': '400um',
+                'offset_x': '200um',
+                'offset_y': '0um',
+                'rotation': '0'
+            }, 0.045, (-0.325, -0.075, -0.025, 0.075), 0)
+        }
+
+        for name, (inner, area, bounds, interiors) in expected.items():
+            RectangleHollow(design,
+                            name,
+                            options=dict(rotation='90', inner=inner))
+            rect = design._qgeometry.get_component_geometry_dict(
+                name)['poly'][0]
+
+            self.assertEqual(rect.geom_type, 'Polygon')
+            self.assertAlmostEqual(rect.area, area)
+            self.assertIterableAlmostEqual(bounds, rect.bounds)
+            self.assertEqual(len(rect.interiors), interiors)
+
     def test_qlibrary_rename_component(self):
         """Test rename_component in element_handler.py."""
         design = designs.DesignPlanar()
@@ -13,14 +13,13 @@
 # that they have been altered from the originals.
 
 # pylint: disable-msg=unnecessary-pass
-# pylint: disable-msg=broad-except
 # pylint: disable-msg=too-many-public-methods
 # pylint: disable-msg=import-error
 # pylint: disable-msg=protected-access
+# pylint: disable-msg=import-outside-toplevel
 """Qiskit Metal unit tests analyses functionality."""
 
 import unittest
-import matplotlib.pyplot as _plt
 
 from qiskit_metal import designs
 from qiskit_metal.renderers import setup_default
@@ -35,13 +34,65 @@ from qiskit_metal.renderers.renderer_mpl.mpl_interaction import MplInteraction
 from qiskit_metal.renderers.renderer_ansys import ansys_renderer
 
 from qiskit_metal.qgeometries.qgeometries_handler import QGeometryTables
-from qiskit_metal.qlibrary.qubits.transmon_pocket import TransmonPocket
 from qiskit_metal import draw
 
+# Expected default_options of QGDSRenderer
+EXPECTED_GDS_DEFAULT_OPTIONS = {
+    'short_segments_to_not_fillet': 'True',
+    'check_short_segments_by_scaling_fillet': '2.0',
+    'gds_unit': '1',
+    'ground_plane': 'True',
+    'negative_mask': {
+        'main': []
+    },
+    'corners': 'circular bend',
+    'tolerance': '0.00001',
+    'precision': '0.000000001',
+    'width_LineString': '10um',
+    'path_filename': '../resources/Fake_Junctions.GDS',
+    'junction_pad_overlap': '5um',
+    'max_points': '199',
+    'cheese': {
+        'datatype': '100',
+        'shape': '0',
+        'cheese_0_x': '25um',
+        'cheese_0_y': '25um',
+        'cheese_1_radius': '100um',
+        'view_in_file': {
+            'main': {
+                1: True
+            }
+        },
+        'delta_x': '100um',
+        'delta_y': '100um',
+        'edge_nocheese': '200um'
+    },
+    'no_cheese': {
+        'datatype': '99',
+        'buffer': '25um',
+        'cap_style': '2',
+        'join_style': '2',
+        'view_in_file': {
+            'main': {
+                1: True
+            }
+        }
+    },
+    'bounding_box_scale_x': '1.2',
+    'bounding_box_scale_y': '1.2'
+}
+
 
 class TestRenderers(unittest.TestCase):
     """Unit test class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Setup the design and QGDSRenderer shared by the tests which only
+        read from them."""
+        cls.design = designs.DesignPlanar()
+        cls.gds_renderer = QGDSRenderer(cls.design)
+
     def setUp(self):
         """Setup unit test."""
         pass
@@ -53,98 +104,50 @@ class TestRenderers(unittest.TestCase):
     def test_renderer_instantiate_qrenderer(self):
         """Test instantiation of QRenderer in renderer_base.py."""
         design = designs.DesignPlanar()
-        try:
-            QRenderer(design)
-        except Exception:
-            self.fail("QRender(design) failed")
-
-        try:
-            QRenderer(design, initiate=False)
-        except Exception:
-            self.fail("QRenderer(design, initiate=False) failed")
-
-        try:
-            QRenderer(design, initiate=False, render_template={})
-        except Exception:
-            self.fail(
-                "QRenderer(design, initiate=False, render_template={}) failed")
-
-        try:
-            QRenderer(design, initiate=False, render_options={})
-        except Exception:
-            self.fail(
-                "QRenderer(design, initiate=False, render_options={}) failed")
+        for kwargs in ({}, dict(initiate=False),
+                       dict(initiate=False, render_template={}),
+                       dict(initiate=False, render_options={})):
+            with self.subTest(**kwargs):
+                QRenderer(design, **kwargs)
 
     def test_renderer_instanitate_qansys_renderer(self):
         """Test instantiation of QAnsysRenderer in ansys_renderer.py"""
         design = designs.DesignPlanar()
-        try:
-            QAnsysRenderer(design)
-        except Exception:
-            self.fail("QAnsysRenderer() failed")
+        QAnsysRenderer(design)
 
     def test_renderer_instantiate_qrenderer_gui(self):
         """Test instantiation of QRendererGui in renderer_gui_base.py."""
         design = designs.DesignPlanar()
-        try:
-            QRendererGui(None, design)
-        except Exception:
-            self.fail("QRenderGui(None, design) failed")
-
-        try:
-            QRendererGui(None, design, initiate=False)
-        except Exception:
-            self.fail("QRenderGui(None, design, initiate=False) failed")
+        for kwargs in ({}, dict(initiate=False)):
+            with self.subTest(**kwargs):
+                QRendererGui(None, design, **kwargs)
 
     def test_renderer_instantiate_gdsrender(self):
         """Test instantiation of QGDSRenderer in gds_renderer.py."""
         design = designs.DesignPlanar()
-        try:
-            QGDSRenderer(design)
-        except Exception:
-            self.fail("QGDSRenderer(design) failed")
-
-        try:
-            QGDSRenderer(design, initiate=False)
-        except Exception:
-            self.fail("QGDSRenderer(design, initiate=False) failed")
-
-        try:
-            QGDSRenderer(design, initiate=False, render_template={})
-        except Exception:
-            self.fail(
-                "QGDSRenderer(design, initiate=False, render_template={}) failed"
-            )
-
-        try:
-            QGDSRenderer(design, initiate=False, render_options={})
-        except Exception:
-            self.fail(
-                "QGDSRenderer(design, initiate=False, render_options={}) failed"
-            )
+        for kwargs in ({}, dict(initiate=False),
+                       dict(initiate=False, render_template={}),
+                       dict(initiate=False, render_options={})):
+            with self.subTest(**kwargs):
+                QGDSRenderer(design, **kwargs)
 
     def test_renderer_instantiate_mplinteraction(self):
         """Test instantiation of MplInteraction in mpl_interaction.py."""
-        try:
-            MplInteraction(_plt)
-        except Exception:
-            self.fail("MplInteraction(None) failed")
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as _plt
+
+        MplInteraction(_plt)
 
     def test_renderer_instantiate_qq3d_renderer(self):
         """Test instantiation of QQ3DRenderer in q3d_render.py."""
         design = designs.DesignPlanar()
-        try:
-            QQ3DRenderer(design, initiate=False)
-        except Exception:
-            self.fail("QQ3DRenderer failed")
+        QQ3DRenderer(design, initiate=False)
 
     def test_renderer_instantiate_qhfss_renderer(self):
         """Test instantiation of QHFSSRenderer in q3d_render.py."""
         design = designs.DesignPlanar()
-        try:
-            QHFSSRenderer(design, initiate=False)
-        except Exception:
-            self.fail("QHFSSRenderer failed")
+        QHFSSRenderer(design, initiate=False)
 
     def test_renderer_qansys_renderer_options(self):
         """Test that defaults in QAnsysRenderer were not accidentally changed."""
@@ -262,52 +265,10 @@ class TestRenderers(unittest.TestCase):
     def test_renderer_gdsrenderer_options(self):
         """Test that default_options in QGDSRenderer were not accidentally
         changed."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
-        options = renderer.default_options
+        options = self.gds_renderer.default_options
 
-        self.assertEqual(len(options), 16)
-        self.assertEqual(options['short_segments_to_not_fillet'], 'True')
-        self.assertEqual(options['check_short_segments_by_scaling_fillet'],
-                         '2.0')
-        self.assertEqual(options['gds_unit'], '1')
-        self.assertEqual(options['ground_plane'], 'True')
-        self.assertEqual(options['negative_mask']['main'], [])
-        self.assertEqual(options['corners'], 'circular bend')
-        self.assertEqual(options['tolerance'], '0.00001')
-        self.assertEqual(options['precision'], '0.000000001')
-        self.assertEqual(options['width_LineString'], '10um')
-        self.assertEqual(options['path_filename'],
-                         '../resources/Fake_Junctions.GDS')
-        self.assertEqual(options['junction_pad_overlap'], '5um')
-        self.assertEqual(options['max_points'], '199')
-        self.assertEqual(options['bounding_box_scale_x'], '1.2')
-        self.assertEqual(options['bounding_box_scale_y'], '1.2')
-
-        self.assertEqual(len(options['cheese']), 9)
-        self.assertEqual(len(options['no_cheese']), 5)
-
-        self.assertEqual(options['cheese']['datatype'], '100')
-        self.assertEqual(options['cheese']['shape'], '0')
-        self.assertEqual(options['cheese']['cheese_0_x'], '25um')
-        self.assertEqual(options['cheese']['cheese_0_y'], '25um')
-        self.assertEqual(options['cheese']['cheese_1_radius'], '100um')
-        self.assertEqual(options['cheese']['delta_x'], '100um')
-        self.assertEqual(options['cheese']['delta_y'], '100um')
-        self.assertEqual(options['cheese']['edge_nocheese'], '200um')
-
-        self.assertEqual(options['no_cheese']['datatype'], '99')
-        self.assertEqual(options['no_cheese']['buffer'], '25um')
-        self.assertEqual(options['no_cheese']['cap_style'], '2')
-        self.assertEqual(options['no_cheese']['join_style'], '2')
-
-        self.assertEqual(len(options['cheese']['view_in_file']), 1)
-        self.assertEqual(len(options['cheese']['view_in_file']['main']), 1)
-        self.assertEqual(options['cheese']['view_in_file']['main'][1], True)
-
-        self.assertEqual(len(options['no_cheese']['view_in_file']), 1)
-        self.assertEqual(len(options['no_cheese']['view_in_file']['main']), 1)
-        self.assertEqual(options['no_cheese']['view_in_file']['main'][1], True)
+        self.maxDiff = None
+        self.assertEqual(dict(options), EXPECTED_GDS_DEFAULT_OPTIONS)
 
     def test_renderer_ansys_renderer_get_clean_name(self):
         """Test get_clean_name in ansys_renderer.py"""
@@ -341,19 +302,15 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_gdsrenderer_inclusive_bound(self):
         """Test functionality of inclusive_bound in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
-
         my_list = []
         my_list.append([1, 1, 2, 2])
         my_list.append([3, 3, 5, 5])
         my_list.append([2.2, 2.3, 4.4, 4.9])
-        self.assertEqual(renderer._inclusive_bound(my_list), (1, 1, 5, 5))
+        self.assertEqual(QGDSRenderer._inclusive_bound(my_list), (1, 1, 5, 5))
 
     def test_renderer_scale_max_bounds(self):
         """Test functionality of scale_max_bounds in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         actual = renderer._scale_max_bounds('main', [(1, 1, 3, 3)])
         self.assertEqual(len(actual), 2)
@@ -362,6 +319,8 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_get_chip_names(self):
         """Test functionality of get_chip_names in gds_renderer.py."""
+        from qiskit_metal.qlibrary.qubits.transmon_pocket import TransmonPocket
+
         design = designs.DesignPlanar()
         renderer = QGDSRenderer(design)
 
@@ -416,8 +375,7 @@ class TestRenderers(unittest.TestCase):
     def test_renderer_gdsrenderer_high_level(self):
         """Test that high level defaults were not accidentally changed in
         gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         self.assertEqual(renderer.name, 'gds')
         element_table_data = renderer.element_table_data
@@ -428,14 +386,17 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_gdsrenderer_update_units(self):
         """Test update_units in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
-
-        renderer.options['gds_unit'] = 12345
-        self.assertEqual(renderer.options['gds_unit'], 12345)
+        renderer = self.gds_renderer
+        gds_unit = renderer.options['gds_unit']
+        try:
+            renderer.options['gds_unit'] = 12345
+            self.assertEqual(renderer.options['gds_unit'], 12345)
 
-        renderer._update_units()
-        self.assertEqual(renderer.options['gds_unit'], 0.001)
+            renderer._update_units()
+            self.assertEqual(renderer.options['gds_unit'], 0.001)
+        finally:
+            # Restore the shared renderer for the other tests
+            renderer.options['gds_unit'] = gds_unit
 
     def test_renderer_gdsrenderer_midpoint_xy(self):
         """Test midpoint_xy in gds_renderer.py."""
@@ -447,8 +408,7 @@ class TestRenderers(unittest.TestCase):
     # pylint: disable-msg=unused-variable
     def test_renderer_gdsrenderer_check_qcomps(self):
         """Test check_qcomps in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         actual = []
         actual.append(renderer._check_qcomps([]))
@@ -470,14 +430,17 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_mpl_interaction_disconnect(self):
         """Test disconnect in MplInteraction in mpl_interaction.py."""
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as _plt
+
         mpl = MplInteraction(_plt)
         mpl.disconnect()
         self.assertEqual(mpl.figure, None)
 
     def test_renderer_gds_check_cheese(self):
         """Test check_cheese in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         self.assertEqual(renderer._check_cheese('main', 0), 4)
         self.assertEqual(renderer._check_cheese('main', 1), 1)
@@ -485,8 +448,7 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_gds_check_no_cheese(self):
         """Test check_no_cheese in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         self.assertEqual(renderer._check_no_cheese('main', 0), 4)
         self.assertEqual(renderer._check_no_cheese('main', 1), 1)
@@ -494,8 +456,7 @@ class TestRenderers(unittest.TestCase):
 
     def test_renderer_gds_check_either_cheese(self):
         """Test check_either_cheese in gds_renderer.py."""
-        design = designs.DesignPlanar()
-        renderer = QGDSRenderer(design)
+        renderer = self.gds_renderer
 
         self.assertEqual(renderer._check_either_cheese('main', 0), 6)
         self.assertEqual(renderer._check_either_cheese('main', 1), 1)